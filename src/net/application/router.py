@@ -29,9 +29,11 @@ def __init__(self, name: str = ROUTER_NAME) -> None:
     def run(self) -> None:
         """Processa pacotes indefinidamente, encaminhando via camada de rede."""
         logger.info("[ROTEADOR] Aguardando pacotes...")
+        # Resolvido uma vez: o laço chama receive() uma vez por pacote.
+        receive = self.network.receive
         try:
             while True:
-                self.network.receive()
+                receive()
 
         except KeyboardInterrupt:
             pass
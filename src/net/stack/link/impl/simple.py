@@ -65,13 +65,15 @@ def send(self, packet: Packet, destination: VirtualIPAddress) -> None:
             pacote_dict=packet.to_dict(),
         )
 
-        logger.debug(
-            "[ENLACE] %s -> %s  Quadro enviado. (vip_origem=%s  vip_destino=%s)",
-            self.local_mac,
-            destination_mac,
-            packet.src_vip,
-            destination,
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[ENLACE] %s -> %s  Quadro enviado. (vip_origem=%s  vip_destino=%s)",
+                self.local_mac,
+                destination_mac,
+                packet.src_vip,
+                destination,
+            )
 
         self.physical.send(frame.serializar())
 
@@ -112,12 +114,14 @@ def receive(self) -> Packet | None:
             segmento_dict=cast(dict[str, object], packet_dict["data"]),
         )
 
-        logger.debug(
-            "[ENLACE] %s -> %s  Quadro recebido. (vip_origem=%s  vip_destino=%s)",
-            frame_dict["src_mac"],
-            self.local_mac,
-            packet.src_vip,
-            packet.dst_vip,
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[ENLACE] %s -> %s  Quadro recebido. (vip_origem=%s  vip_destino=%s)",
+                frame_dict["src_mac"],
+                self.local_mac,
+                packet.src_vip,
+                packet.dst_vip,
+            )
 
         return packet
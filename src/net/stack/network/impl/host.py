@@ -62,13 +62,15 @@ def send(self, segment: Segment, destination: VirtualIPAddress) -> None:
             segmento_dict=segment.to_dict(),
         )
 
-        logger.debug(
-            "[REDE] %s -> %s  Pacote enviado. (proximo_salto=%s  ttl=%d)",
-            self.local_vip,
-            destination,
-            next_hop,
-            packet.ttl,
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[REDE] %s -> %s  Pacote enviado. (proximo_salto=%s  ttl=%d)",
+                self.local_vip,
+                destination,
+                next_hop,
+                packet.ttl,
+            )
 
         self.link.send(packet, next_hop)
 
@@ -96,12 +98,14 @@ def receive(self) -> Segment | None:
 
         segment_dict = packet.data
 
-        logger.debug(
-            "[REDE] %s -> %s  Segmento entregue. (ttl=%d)",
-            packet.src_vip,
-            self.local_vip,
-            packet.ttl,
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[REDE] %s -> %s  Segmento entregue. (ttl=%d)",
+                packet.src_vip,
+                self.local_vip,
+                packet.ttl,
+            )
 
         return Segment(
             seq_num=cast(int, segment_dict["seq_num"]),
@@ -36,6 +36,9 @@ class RouterNetwork(Network):
 
     Como roteadores não são destinos finais, `receive()` sempre retorna
     `None`. O encaminhamento é um efeito colateral da chamada.
+
+    A tabela de roteamento é congelada na construção: alterações posteriores no
+    dict recebido não afetam o encaminhamento.
     """
 
     def __init__(
@@ -50,11 +53,16 @@ def __init__(
             link (Link): A camada de enlace subjacente.
             local_vip (VirtualIPAddress): O endereço virtual local do roteador.
             routing_table (dict[VirtualIPAddress, VirtualIPAddress]): Tabela de
-                roteamento completa (todos os destinos conhecidos).
+                roteamento completa (todos os destinos conhecidos). É copiada
+                uma única vez aqui e não é exposta.
         """
         self.link = link
         self.local_vip = local_vip
-        self.routing_table = routing_table
+        # Indexada pela string crua do VIP: encaminhar custa uma única consulta ao
+        # dict, sem criar um VirtualIPAddress por pacote.
+        self._raw_table: dict[str, VirtualIPAddress] = {
+            str(vip): next_hop for vip, next_hop in routing_table.items()
+        }
         self._forwarded = 0
         self._dropped_ttl = 0
         self._dropped_unknown = 0
@@ -78,7 +86,7 @@ def send(self, segment: Segment, destination: VirtualIPAddress) -> None:
         Raises:
             LookupError: Se o destino não estiver na tabela de roteamento.
         """
-        next_hop = self.routing_table.get(destination)
+        next_hop = self._raw_table.get(destination)
 
         if next_hop is None:
             logger.error(
@@ -95,13 +103,15 @@ def send(self, segment: Segment, destination: VirtualIPAddress) -> None:
             segmento_dict=segment.to_dict(),
         )
 
-        logger.debug(
-            "[REDE] %s -> %s  Pacote enviado. (proximo_salto=%s  ttl=%d)",
-            self.local_vip,
-            destination,
-            next_hop,
-            packet.ttl,
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[REDE] %s -> %s  Pacote enviado. (proximo_salto=%s  ttl=%d)",
+                self.local_vip,
+                destination,
+                next_hop,
+                packet.ttl,
+            )
 
         self.link.send(packet, next_hop)
 
@@ -119,6 +129,8 @@ def receive(self) -> Segment | None:
         if packet is None:
             return None
 
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+
         if packet.ttl <= 0:
             logger.warning(
                 "[REDE] %s -> %s  Pacote descartado: TTL expirado.",
@@ -130,7 +142,7 @@ def receive(self) -> Segment | None:
 
         packet.ttl -= 1
 
-        next_hop = self.routing_table.get(VirtualIPAddress(packet.dst_vip))
+        next_hop = self._raw_table.get(packet.dst_vip)
 
         if next_hop is None:
             logger.error(
@@ -141,13 +153,14 @@ def receive(self) -> Segment | None:
             self._dropped_unknown += 1
             return None
 
-        logger.debug(
-            "[REDE] %s -> %s  Pacote encaminhado. (proximo_salto=%s  ttl=%d)",
-            packet.src_vip,
-            packet.dst_vip,
-            next_hop,
-            packet.ttl,
-        )
+        if dbg_enabled:
+            logger.debug(
+                "[REDE] %s -> %s  Pacote encaminhado. (proximo_salto=%s  ttl=%d)",
+                packet.src_vip,
+                packet.dst_vip,
+                next_hop,
+                packet.ttl,
+            )
 
         self.link.send(packet, next_hop)
         self._forwarded += 1
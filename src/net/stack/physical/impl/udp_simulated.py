@@ -67,15 +67,17 @@ def send(self, data: bytes) -> None:
             logger.error("[FISICA] MAC desconhecido na tabela: %s", destination_mac)
             return
 
-        destination_str = f"{destination_address.ip}:{destination_address.port}"
-        logger.debug(
-            "[FISICA] %s -> %s  Quadro enviado. (src_mac=%s  dst_mac=%s  tamanho=%d bytes)",  # noqa: E501
-            self._local_address,
-            destination_str,
-            source_mac,
-            destination_mac,
-            len(data),
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            destination_str = f"{destination_address.ip}:{destination_address.port}"
+            logger.debug(
+                "[FISICA] %s -> %s  Quadro enviado. (src_mac=%s  dst_mac=%s  tamanho=%d bytes)",  # noqa: E501
+                self._local_address,
+                destination_str,
+                source_mac,
+                destination_mac,
+                len(data),
+            )
 
         send_over_noisy_channel(
             self.sock,
@@ -91,13 +93,15 @@ def receive(self) -> bytes:
         """
         try:
             data, (src_host, src_port) = self.sock.recvfrom(_UDP_BUFFER_SIZE)
-            logger.debug(
-                "[FISICA] %s:%d -> %s  Quadro recebido. (tamanho=%d bytes)",
-                src_host,
-                src_port,
-                self._local_address,
-                len(data),
-            )
+            dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+            if dbg_enabled:
+                logger.debug(
+                    "[FISICA] %s:%d -> %s  Quadro recebido. (tamanho=%d bytes)",
+                    src_host,
+                    src_port,
+                    self._local_address,
+                    len(data),
+                )
             return data
 
         except TimeoutError:
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 
-import base64
+import binascii
 import logging
 import queue
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
+from typing import Generic, TypeVar, cast
 
 from net.base import Segment
 from net.model import VirtualAddress
@@ -20,6 +22,66 @@
 MSS: int = 4096
 MAX_FIN_RETRIES: int = 8
 
+_T = TypeVar("_T")
+
+
+class _Mailbox(Generic[_T]):
+    """Fila FIFO sem limite, com um deque e um Event no lugar de `queue.Queue`.
+
+    Nada é descartado: o ACK esperado e o marcador de `abort()` continuam na
+    fila mesmo que outros segmentos cheguem depois deles.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa a caixa vazia."""
+        self._items: deque[_T] = deque()
+        self._ready = threading.Event()
+
+    def put(self, item: _T) -> None:
+        """Enfileira um item e acorda o consumidor.
+
+        Args:
+            item (_T): O item a ser enfileirado.
+        """
+        self._items.append(item)
+        self._ready.set()
+
+    def get(self, timeout: float | None = None) -> _T:
+        """Remove o item mais antigo, aguardando até `timeout` segundos.
+
+        Args:
+            timeout (float | None): Tempo máximo de espera, ou None para sempre.
+
+        Returns:
+            _T: O item removido.
+
+        Raises:
+            queue.Empty: Se nenhum item chegar dentro do prazo.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            try:
+                return self._items.popleft()
+
+            except IndexError:
+                pass
+
+            # Limpar só depois do wait: um put entre o popleft e o clear
+            # ainda é visto na próxima volta.
+            if deadline is None:
+                self._ready.wait()
+
+            elif not self._ready.wait(max(0.0, deadline - time.monotonic())):
+                # Um put pode ter enfileirado sem ainda ter sinalizado.
+                try:
+                    return self._items.popleft()
+
+                except IndexError:
+                    raise queue.Empty from None
+
+            self._ready.clear()
+
 
 class ReliableConnection(Connection):
     """Conexão confiável Stop-and-Wait sobre a camada de rede."""
@@ -45,32 +107,44 @@ def __init__(
         self.on_close = on_close
         self.send_sequence = 0
         self.receive_sequence = 0
-        self.ack_queue: queue.Queue[Segment] = queue.Queue()
-        self.syn_ack_queue: queue.Queue[Segment] = queue.Queue()
-        self.fin_queue: queue.Queue[int] = queue.Queue()
-        self.data_queue: queue.Queue[Segment | None] = queue.Queue()
+        self.ack_queue: _Mailbox[Segment] = _Mailbox()
+        self.syn_ack_queue: _Mailbox[Segment] = _Mailbox()
+        self.fin_received = threading.Event()
+        self.data_queue: _Mailbox[Segment | None] = _Mailbox()
         self.connected: bool = False
         self.closed: bool = False
         self.close_lock = threading.Lock()
         self.send_lock = threading.Lock()
+        # Destino e método de envio são fixos: resolvidos aqui, não a cada segmento.
+        self._net_send = network.send
+        self._remote_vip = remote_address.vip
+        # Campos constantes durante toda a conexão, copiados em cada payload.
+        self._base_payload: dict[str, object] = {
+            "src_ip": local_address.vip,
+            "src_port": local_address.port,
+            "dst_port": remote_address.port,
+        }
+        # Só há dois números de sequência, então os ACKs são montados uma única vez.
+        # Podem ser reenviados porque as camadas inferiores só os serializam.
+        self._ack_segments = tuple(
+            Segment(
+                seq_num=sequence,
+                is_ack=True,
+                payload={**self._base_payload, "data": "", "more": False},
+            )
+            for sequence in (0, 1)
+        )
 
     def connect(self) -> None:
         """Lado ativo do handshake de 3 vias (SYN / SYN-ACK / ACK)."""
         syn = Segment(
             seq_num=0,
             is_ack=False,
-            payload={
-                "src_ip": self.local_address.vip,
-                "src_port": self.local_address.port,
-                "dst_port": self.remote_address.port,
-                "data": "",
-                "syn": True,
-                "more": False,
-            },
+            payload={**self._base_payload, "data": "", "syn": True, "more": False},
         )
 
         while True:
-            self.network.send(syn, self.remote_address.vip)
+            self._net_send(syn, self._remote_vip)
             logger.debug(
                 "[TRANSPORTE] %s -> %s  SYN enviado.",
                 self.local_address,
@@ -105,18 +179,11 @@ def accept(self) -> None:
         syn_ack = Segment(
             seq_num=0,
             is_ack=True,
-            payload={
-                "src_ip": self.local_address.vip,
-                "src_port": self.local_address.port,
-                "dst_port": self.remote_address.port,
-                "data": "",
-                "syn": True,
-                "more": False,
-            },
+            payload={**self._base_payload, "data": "", "syn": True, "more": False},
         )
 
         while True:
-            self.network.send(syn_ack, self.remote_address.vip)
+            self._net_send(syn_ack, self._remote_vip)
             logger.debug(
                 "[TRANSPORTE] %s -> %s  SYN-ACK enviado.",
                 self.local_address,
@@ -145,12 +212,14 @@ def send(self, data: bytes) -> None:
         Args:
             data (bytes): Os dados a serem enviados.
         """
-        logger.debug(
-            "[TRANSPORTE] %s -> %s  Enviando %d byte(s).",
-            self.local_address,
-            self.remote_address,
-            len(data),
-        )
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[TRANSPORTE] %s -> %s  Enviando %d byte(s).",
+                self.local_address,
+                self.remote_address,
+                len(data),
+            )
         chunks = [data[i : i + MSS] for i in range(0, max(1, len(data)), MSS)]
 
         with self.send_lock:
@@ -164,13 +233,17 @@ def receive(self) -> bytes | None:
         Returns:
             bytes | None: Os dados recebidos, ou None se a conexão foi fechada.
         """
-        logger.debug("[TRANSPORTE] %s  Aguardando dados...", self.local_address)
-        buffer = bytearray()
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        if dbg_enabled:
+            logger.debug("[TRANSPORTE] %s  Aguardando dados...", self.local_address)
+
+        chunks: list[bytes] = []
 
         try:
             while True:
                 segment = self._receive_chunk()
-                buffer += base64.b64decode(str(segment.payload["data"]))
+                chunks.append(binascii.a2b_base64(cast(str, segment.payload["data"])))
 
                 if not segment.payload.get("more", False):
                     break
@@ -178,12 +251,14 @@ def receive(self) -> bytes | None:
         except EOFError:
             return None
 
-        logger.debug(
-            "[TRANSPORTE] %s  %d byte(s) recebidos.",
-            self.local_address,
-            len(buffer),
-        )
-        return bytes(buffer)
+        data = b"".join(chunks)
+        if dbg_enabled:
+            logger.debug(
+                "[TRANSPORTE] %s  %d byte(s) recebidos.",
+                self.local_address,
+                len(data),
+            )
+        return data
 
     def abort(self) -> None:
         """Encerra a conexão imediatamente, sem handshake, desbloqueando threads em espera."""
@@ -193,14 +268,14 @@ def abort(self) -> None:
             self.closed = True
 
         self.data_queue.put(None)
-        self.ack_queue.put_nowait(
+        self.ack_queue.put(
             type(
                 "_Abort",
                 (),
                 {"sequence_number": self.send_sequence},
             )()
         )
-        self.fin_queue.put(-1)
+        self.fin_received.set()
 
         if self.on_close is not None:
             self.on_close()
@@ -218,24 +293,17 @@ def close(self) -> None:
                 return
             self.closed = True
 
-        passive = not self.fin_queue.empty()
+        passive = self.fin_received.is_set()
 
         fin = Segment(
             seq_num=self.send_sequence,
             is_ack=False,
-            payload={
-                "src_ip": self.local_address.vip,
-                "src_port": self.local_address.port,
-                "dst_port": self.remote_address.port,
-                "data": "",
-                "fin": True,
-                "more": False,
-            },
+            payload={**self._base_payload, "data": "", "fin": True, "more": False},
         )
 
         # Enviar FIN e aguardar ACK (até MAX_FIN_RETRIES tentativas)
         for attempt in range(1, MAX_FIN_RETRIES + 1):
-            self.network.send(fin, self.remote_address.vip)
+            self._net_send(fin, self._remote_vip)
             logger.debug(
                 "[TRANSPORTE] %s -> %s  FIN enviado. (seq=%d, tentativa=%d/%d)",
                 self.local_address,
@@ -282,7 +350,7 @@ def close(self) -> None:
             "[TRANSPORTE] %s  Aguardando FIN do peer (FIN_WAIT_2)…",
             self.local_address,
         )
-        self.fin_queue.get()  # Bloqueia até o FIN chegar
+        self.fin_received.wait()  # Bloqueia até o FIN chegar
         logger.debug(
             "[TRANSPORTE] %s -> %s  Conexão encerrada (4-way FIN).",
             self.local_address,
@@ -298,24 +366,26 @@ def _send_ack(self, ack_sequence: int) -> None:
         Args:
             ack_sequence (int): O número de sequência a ser ACKed.
         """
-        ack = Segment(
-            seq_num=ack_sequence,
-            is_ack=True,
-            payload={
-                "src_ip": self.local_address.vip,
-                "src_port": self.local_address.port,
-                "dst_port": self.remote_address.port,
-                "data": "",
-                "more": False,
-            },
-        )
-        self.network.send(ack, self.remote_address.vip)
-        logger.debug(
-            "[TRANSPORTE] %s -> %s  ACK enviado. (seq=%d)",
-            self.local_address,
-            self.remote_address,
-            ack_sequence,
-        )
+        if ack_sequence == 0 or ack_sequence == 1:
+            ack = self._ack_segments[ack_sequence]
+
+        else:
+            # O número do FIN vem do peer e pode fugir de {0, 1}: ecoar sem indexar.
+            ack = Segment(
+                seq_num=ack_sequence,
+                is_ack=True,
+                payload={**self._base_payload, "data": "", "more": False},
+            )
+
+        self._net_send(ack, self._remote_vip)
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        if dbg_enabled:
+            logger.debug(
+                "[TRANSPORTE] %s -> %s  ACK enviado. (seq=%d)",
+                self.local_address,
+                self.remote_address,
+                ack_sequence,
+            )
 
     def _send_chunk(self, chunk: bytes, *, more: bool) -> None:
         """Envia um fragmento de dados com o número de sequência atual e aguarda o ACK.
@@ -324,53 +394,61 @@ def _send_chunk(self, chunk: bytes, *, more: bool) -> None:
             chunk (bytes): O fragmento de dados a ser enviado.
             more (bool): Indica se há mais fragmentos a serem enviados após este.
         """
+        send_sequence = self.send_sequence
+        ack_queue = self.ack_queue
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
         segment = Segment(
-            seq_num=self.send_sequence,
+            seq_num=send_sequence,
             is_ack=False,
             payload={
-                "src_ip": self.local_address.vip,
-                "src_port": self.local_address.port,
-                "dst_port": self.remote_address.port,
-                "data": base64.b64encode(chunk).decode(),
+                **self._base_payload,
+                # O quadro é serializado em JSON, que não transporta bytes crus.
+                "data": binascii.b2a_base64(chunk, newline=False).decode("ascii"),
                 "more": more,
             },
         )
 
+        # Sem perdas, a primeira volta já é o caminho rápido: um único get() que
+        # devolve o ACK esperado, sem retransmitir nem reler o relógio.
         while True:
-            self.network.send(segment, self.remote_address.vip)
-            deadline = time.time() + TIMEOUT
+            self._net_send(segment, self._remote_vip)
+            deadline = time.monotonic() + TIMEOUT
+            remaining = TIMEOUT
 
-            while time.time() < deadline:
+            while remaining > 0:
                 try:
-                    ack_sequence = self.ack_queue.get(timeout=deadline - time.time())
+                    ack_sequence = ack_queue.get(timeout=remaining)
 
                 # Retransmitir se o timeout expirar sem receber o ACK esperado
                 except queue.Empty:
                     break
 
-                if ack_sequence.sequence_number == self.send_sequence:
-                    logger.debug(
-                        "[TRANSPORTE] %s -> %s  Chunk confirmado. (seq=%d)",
-                        self.local_address,
-                        self.remote_address,
-                        self.send_sequence,
-                    )
+                if ack_sequence.sequence_number == send_sequence:
+                    if dbg_enabled:
+                        logger.debug(
+                            "[TRANSPORTE] %s -> %s  Chunk confirmado. (seq=%d)",
+                            self.local_address,
+                            self.remote_address,
+                            send_sequence,
+                        )
                     self.send_sequence ^= 1
                     return
 
                 # Descartar ACKs duplicados ou fora de ordem
-                logger.debug(
-                    "[TRANSPORTE] %s  ACK duplicado descartado. (recebido=%d esperado=%d)",  # noqa: E501
-                    self.local_address,
-                    ack_sequence.sequence_number,
-                    self.send_sequence,
-                )
+                if dbg_enabled:
+                    logger.debug(
+                        "[TRANSPORTE] %s  ACK duplicado descartado. (recebido=%d esperado=%d)",  # noqa: E501
+                        self.local_address,
+                        ack_sequence.sequence_number,
+                        send_sequence,
+                    )
+                remaining = deadline - time.monotonic()
 
             logger.warning(
                 "[TRANSPORTE] %s -> %s  Timeout, retransmitindo. (seq=%d)",
                 self.local_address,
                 self.remote_address,
-                self.send_sequence,
+                send_sequence,
             )
 
     def dispatch(self, segment: Segment) -> None:
@@ -380,65 +458,75 @@ def dispatch(self, segment: Segment) -> None:
         - SYN puro (is_ack=False, syn=True)  -> data_queue    (consumido por accept())
         - SYN-ACK  (is_ack=True,  syn=True)  -> syn_ack_queue (consumido por connect())
         - ACK puro de SYN (is_ack=True, syn=True sem dados)  -> ack_queue (handshake passivo)
-        - FIN      (fin=True)                -> ACK imediato + fin_queue + data_queue=None
+        - FIN      (fin=True)                -> ACK + fin_received + data_queue=None
         - ACK de dados/FIN                   -> ack_queue
         - Dados                              -> data_queue
 
         Args:
             segment (Segment): O segmento a ser encaminhado.
         """
-        if segment.payload.get("fin"):
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+        payload = segment.payload
+
+        if payload.get("fin"):
             self._send_ack(segment.sequence_number)
-            logger.debug(
-                "[TRANSPORTE] %s  FIN recebido. ACK enviado.",
-                self.local_address,
-            )
-            self.fin_queue.put(segment.sequence_number)
+            if dbg_enabled:
+                logger.debug(
+                    "[TRANSPORTE] %s  FIN recebido. ACK enviado.",
+                    self.local_address,
+                )
+            self.fin_received.set()
             self.data_queue.put(None)
             return
 
-        if segment.payload.get("syn"):
+        if payload.get("syn"):
             if segment.is_ack:
                 if self.connected:
-                    logger.debug(
-                        "[TRANSPORTE] %s  SYN-ACK retransmitido, reenviando ACK.",
-                        self.local_address,
-                    )
+                    if dbg_enabled:
+                        logger.debug(
+                            "[TRANSPORTE] %s  SYN-ACK retransmitido, reenviando ACK.",
+                            self.local_address,
+                        )
                     self._send_ack(0)
                 else:
-                    logger.debug(
-                        "[TRANSPORTE] %s  SYN-ACK recebido.",
-                        self.local_address,
-                    )
+                    if dbg_enabled:
+                        logger.debug(
+                            "[TRANSPORTE] %s  SYN-ACK recebido.",
+                            self.local_address,
+                        )
                     self.syn_ack_queue.put(segment)
             else:
                 if self.connected:
-                    logger.debug(
-                        "[TRANSPORTE] %s  SYN duplicado descartado (já conectado).",
-                        self.local_address,
-                    )
+                    if dbg_enabled:
+                        logger.debug(
+                            "[TRANSPORTE] %s  SYN duplicado descartado (já conectado).",
+                            self.local_address,
+                        )
                 else:
-                    logger.debug(
-                        "[TRANSPORTE] %s  SYN recebido.",
-                        self.local_address,
-                    )
+                    if dbg_enabled:
+                        logger.debug(
+                            "[TRANSPORTE] %s  SYN recebido.",
+                            self.local_address,
+                        )
                     self.data_queue.put(segment)
             return
 
         if segment.is_ack:
-            logger.debug(
-                "[TRANSPORTE] %s  ACK despachado. (seq=%d)",
-                self.local_address,
-                segment.sequence_number,
-            )
+            if dbg_enabled:
+                logger.debug(
+                    "[TRANSPORTE] %s  ACK despachado. (seq=%d)",
+                    self.local_address,
+                    segment.sequence_number,
+                )
             self.ack_queue.put(segment)
 
         else:
-            logger.debug(
-                "[TRANSPORTE] %s  Dados despachados. (seq=%d)",
-                self.local_address,
-                segment.sequence_number,
-            )
+            if dbg_enabled:
+                logger.debug(
+                    "[TRANSPORTE] %s  Dados despachados. (seq=%d)",
+                    self.local_address,
+                    segment.sequence_number,
+                )
             self.data_queue.put(segment)
 
     def _receive_chunk(self) -> Segment:
@@ -447,8 +535,11 @@ def _receive_chunk(self) -> Segment:
         Returns:
             Segment: O segmento recebido com o número de sequência esperado.
         """
+        data_queue = self.data_queue
+        dbg_enabled = logger.isEnabledFor(logging.DEBUG)
+
         while True:
-            item = self.data_queue.get()
+            item = data_queue.get()
 
             if item is None:
                 raise EOFError
@@ -456,20 +547,22 @@ def _receive_chunk(self) -> Segment:
             segment = item
 
             if segment.sequence_number != self.receive_sequence:
-                logger.debug(
-                    "[TRANSPORTE] %s  Duplicata descartada. (recebido=%d esperado=%d)",
-                    self.local_address,
-                    segment.sequence_number,
-                    self.receive_sequence,
-                )
+                if dbg_enabled:
+                    logger.debug(
+                        "[TRANSPORTE] %s  Duplicata descartada. (recebido=%d esperado=%d)",
+                        self.local_address,
+                        segment.sequence_number,
+                        self.receive_sequence,
+                    )
                 self._send_ack(self.receive_sequence ^ 1)
                 continue
 
             self._send_ack(segment.sequence_number)
             self.receive_sequence ^= 1
-            logger.debug(
-                "[TRANSPORTE] %s  Chunk aceito. (seq=%d)",
-                self.local_address,
-                segment.sequence_number,
-            )
+            if dbg_enabled:
+                logger.debug(
+                    "[TRANSPORTE] %s  Chunk aceito. (seq=%d)",
+                    self.local_address,
+                    segment.sequence_number,
+                )
             return segment
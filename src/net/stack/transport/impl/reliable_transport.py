@@ -6,17 +6,19 @@
 import logging
 import queue
 import threading
+from typing import cast
 
 from net.base import Segment
 from net.model import VirtualAddress, VirtualIPAddress
-from net.model.address import Port
 from net.stack.network import Network
 from net.stack.transport import Connection, Transport
 from net.stack.transport.impl.reliable_connection import ReliableConnection
 
 logger = logging.getLogger(__name__)
 
-ConnectionKey = tuple[VirtualIPAddress, Port, Port]
+# (VIP remoto, porta remota, porta local) com os valores crus do payload. Como
+# VirtualIPAddress e Port derivam de str e int, as chaves de connect() coincidem.
+ConnectionKey = tuple[str, int, int]
 
 
 class ReliableTransport(Transport):
@@ -108,29 +110,35 @@ def _remove(self, key: ConnectionKey) -> None:
         )
 
     def _dispatch_loop(self) -> None:
+        receive = self.network.receive
+        route = self._route
+
         while True:
-            segment = self.network.receive()
+            segment = receive()
 
             if segment is None:
                 continue
 
-            self._route(segment)
+            route(segment)
 
     def _route(self, segment: Segment) -> None:
-        remote_vip = VirtualIPAddress(str(segment.payload["src_ip"]))
-        remote_port = Port(int(str(segment.payload["src_port"])))
-        local_port = Port(int(str(segment.payload["dst_port"])))
-        key: ConnectionKey = (remote_vip, remote_port, local_port)
+        # O payload já chega tipado do JSON; VirtualIPAddress e Port só são
+        # construídos quando uma conexão nova é criada ou um segmento é enviado.
+        payload = segment.payload
+        remote_vip = cast(str, payload["src_ip"])
+        remote_port = cast(int, payload["src_port"])
+        key: ConnectionKey = (remote_vip, remote_port, cast(int, payload["dst_port"]))
 
-        with self.lock:
-            conn = self.connections.get(key)
+        # Leitura sem lock: dict.get é atômico sob o GIL e só as mutações,
+        # bem mais raras que os segmentos, disputam self.lock.
+        conn = self.connections.get(key)
 
         if conn is not None:
             conn.dispatch(segment)
             return
 
         # Segmento inesperado sem conexão registrada
-        if segment.payload.get("fin"):
+        if payload.get("fin"):
             # ACK original pode ter sido perdido, re-enviar.
             ack = Segment(
                 seq_num=segment.sequence_number,
@@ -143,7 +151,7 @@ def _route(self, segment: Segment) -> None:
                     "more": False,
                 },
             )
-            self.network.send(ack, remote_vip)
+            self.network.send(ack, VirtualIPAddress(remote_vip))
             logger.debug(
                 "[TRANSPORTE] %s  Re-ACK de FIN enviado. (src=%s:%d)",
                 self.local_address,
@@ -152,7 +160,7 @@ def _route(self, segment: Segment) -> None:
             )
             return
 
-        if not segment.payload.get("syn") or segment.is_ack:
+        if not payload.get("syn") or segment.is_ack:
             # Segmento de dados ou ACK avulso sem conexão registrada - descartar.
             logger.debug(
                 "[TRANSPORTE] %s  Segmento descartado (sem conexão). (src=%s:%d)",
@@ -171,7 +179,12 @@ def _route(self, segment: Segment) -> None:
             on_close=lambda: self._remove(key),
         )
         with self.lock:
-            self.connections[key] = new_connection
+            connection = self.connections.setdefault(key, new_connection)
+
+        if connection is not new_connection:
+            # Uma conexão para a mesma chave foi registrada desde a leitura.
+            connection.dispatch(segment)
+            return
 
         new_connection.dispatch(segment)
         self.accept_queue.put(new_connection)